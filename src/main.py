@@ -1,14 +1,23 @@
 from fastapi import FastAPI, HTTPException, Query
-from datetime import datetime, timezone, timedelta
+from fastapi.responses import ORJSONResponse
+from datetime import date, datetime, timezone, timedelta
 from pydantic import BaseModel
-from typing import Optional, Dict, List
+from typing import Annotated, Optional, Dict, List
+from collections import OrderedDict
+from functools import lru_cache
 import logging
+import os
+import time
 
-# Configure logging for debugging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging - set LOG_LEVEL=DEBUG to see the step-by-step debug output
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING").upper())
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="DateTime API", version="1.0.0")
+app = FastAPI(
+    title="DateTime API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # Supported timezones for conversion
 TIMEZONE_OFFSETS = {
@@ -20,7 +29,17 @@ TIMEZONE_OFFSETS = {
     "AEST": 10,
 }
 
+# Fixed-offset tzinfo objects, built once so conversions don't rebuild them per request
+TZINFOS = {
+    name: timezone(timedelta(hours=hours), name=name)
+    for name, hours in TIMEZONE_OFFSETS.items()
+}
+
+# Offsets as floats, ready to be returned as time differences
+TIMEZONE_OFFSETS_F = {name: float(hours) for name, hours in TIMEZONE_OFFSETS.items()}
 
+
+# Response schemas - used for the OpenAPI docs only, handlers return plain dicts
 class DateTimeResponse(BaseModel):
     utc_datetime: str
     timestamp: float
@@ -43,8 +62,21 @@ class BusinessHoursResponse(BaseModel):
     hours_until_close: Optional[float] = None
 
 
+# Per-second response caches: the answer only changes once per second, so
+# repeated hits within the same second reuse the already-built response.
+# Cached responses are not served with DEBUG logging on, so breakpoints in the
+# handlers are hit on every request while debugging
+RESPONSE_CACHE_SIZE = 256
+_DT_CACHE: OrderedDict[tuple[Optional[str], int], dict] = OrderedDict()
+_BH_CACHE: OrderedDict[tuple[str, int, int, int], dict] = OrderedDict()
+
+# Business day boundaries only change once per local day
+BIZ_CACHE_SIZE = 128
+_BIZ_CACHE: OrderedDict[tuple[str, int, int, date], tuple[str, str]] = OrderedDict()
+
+
 @app.get("/")
-async def root():
+def root():
     """Root endpoint with API information"""
     logger.info("Root endpoint accessed")
     return {
@@ -58,137 +90,187 @@ async def root():
     }
 
 
-@app.get("/datetime", response_model=DateTimeResponse)
+@app.get("/datetime", responses={200: {"model": DateTimeResponse}})
 async def get_current_datetime(
-    tz: Optional[str] = Query(None, description="Timezone code (e.g., EST, PST, CET)")
+    tz: Annotated[
+        Optional[str], Query(description="Timezone code (e.g., EST, PST, CET)")
+    ] = None,
 ):
     """Returns the current date and time in UTC or specified timezone"""
-    logger.debug(f"Getting current datetime for timezone: {tz}")
+    logger.debug("Getting current datetime for timezone: %s", tz)
+    
+    now_ts = time.time()
+    cache_key = (tz, int(now_ts))
+    cached = _DT_CACHE.get(cache_key)
+    if cached is not None and not logger.isEnabledFor(logging.DEBUG):
+        return cached
     
-    now_utc = datetime.now(timezone.utc)
+    now_utc = datetime.fromtimestamp(now_ts, timezone.utc)
     local_time = None
     timezone_name = "UTC"
     
     if tz:
         # This is a good place to set a breakpoint to debug timezone conversion
-        local_time, timezone_name = _convert_to_timezone(now_utc, tz)
-        logger.info(f"Converted UTC time to {timezone_name}: {local_time}")
+        # Codes are usually sent already uppercase, so only upper() when needed
+        tzinfos = TZINFOS
+        code = tz if tz in tzinfos else tz.upper()
+        tzinfo = tzinfos.get(code)
+        if tzinfo is None:
+            logger.warning("Unknown timezone %s, defaulting to UTC", tz)
+            local_time = now_utc.isoformat()
+        else:
+            local_time = now_utc.astimezone(tzinfo).isoformat()
+            timezone_name = code
+        logger.info("Converted UTC time to %s: %s", timezone_name, local_time)
     
-    return DateTimeResponse(
-        utc_datetime=now_utc.isoformat(),
-        timestamp=now_utc.timestamp(),
-        timezone=timezone_name,
-        local_datetime=local_time,
-    )
+    response = {
+        "utc_datetime": now_utc.isoformat(),
+        "timestamp": now_ts,
+        "timezone": timezone_name,
+        "local_datetime": local_time,
+    }
+    _cache_response(_DT_CACHE, cache_key, response)
+    return response
 
 
-@app.get("/datetime/convert", response_model=TimezoneConversion)
+@app.get("/datetime/convert", responses={200: {"model": TimezoneConversion}})
 async def convert_timezones(
-    time_str: str = Query(..., description="ISO format datetime string"),
-    timezones: str = Query("EST,PST,CET", description="Comma-separated timezone codes"),
+    time_str: Annotated[str, Query(description="ISO format datetime string")],
+    timezones: Annotated[
+        str, Query(description="Comma-separated timezone codes")
+    ] = "EST,PST,CET",
 ):
     """Convert a given time to multiple timezones"""
-    logger.debug(f"Converting time {time_str} to timezones: {timezones}")
+    logger.debug("Converting time %s to timezones: %s", time_str, timezones)
     
     try:
         # Parse the input datetime - good debugging point for format errors
-        original_dt = datetime.fromisoformat(time_str.replace("Z", "+00:00"))
-        logger.info(f"Parsed datetime: {original_dt}")
+        original_dt = _parse_iso(time_str)
+        logger.info("Parsed datetime: %s", original_dt)
     except ValueError as e:
-        logger.error(f"Failed to parse datetime: {e}")
+        logger.error("Failed to parse datetime: %s", e)
         raise HTTPException(status_code=400, detail=f"Invalid datetime format: {e}")
     
-    tz_list = [tz.strip().upper() for tz in timezones.split(",")]
-    converted_times = {}
-    time_differences = {}
+    # Naive input is treated as UTC
+    aware_dt = original_dt
+    if aware_dt.tzinfo is None:
+        aware_dt = aware_dt.replace(tzinfo=timezone.utc)
+    
+    # Local aliases for names used on every loop iteration
+    tzinfos = TZINFOS
+    offsets = TIMEZONE_OFFSETS_F
+    to_local = aware_dt.astimezone
+    to_iso = datetime.isoformat
+    log_debug = logger.debug
+    
+    valid_codes = []
+    for raw in timezones.split(","):
+        tz = raw.strip()
+        if tz not in tzinfos:
+            tz = tz.upper()
+            if tz not in tzinfos:
+                logger.warning("Unknown timezone: %s, skipping", tz)
+                continue
+        valid_codes.append(tz)
+    
+    # Pre-size both dicts with the valid (de-duplicated) codes, then fill them in place
+    converted_times = dict.fromkeys(valid_codes)
+    time_differences = dict.fromkeys(valid_codes)
     
     # Complex loop - great for step-through debugging
-    for tz in tz_list:
-        if tz not in TIMEZONE_OFFSETS:
-            logger.warning(f"Unknown timezone: {tz}, skipping")
-            continue
-        
-        converted_time, _ = _convert_to_timezone(original_dt, tz)
+    for tz in converted_times:
+        converted_time = to_iso(to_local(tzinfos[tz]))
         converted_times[tz] = converted_time
         
-        # Calculate time difference in hours
-        time_diff = _calculate_time_difference(original_dt, tz)
+        # Time difference in hours
+        time_diff = offsets[tz]
         time_differences[tz] = time_diff
-        logger.debug(f"Timezone {tz}: {converted_time} (diff: {time_diff}h)")
+        log_debug("Timezone %s: %s (diff: %sh)", tz, converted_time, time_diff)
     
-    return TimezoneConversion(
-        original_time=original_dt.isoformat(),
-        converted_times=converted_times,
-        time_differences=time_differences,
-    )
+    return {
+        "original_time": original_dt.isoformat(),
+        "converted_times": converted_times,
+        "time_differences": time_differences,
+    }
 
 
-@app.get("/business-hours", response_model=BusinessHoursResponse)
+@app.get("/business-hours", responses={200: {"model": BusinessHoursResponse}})
 async def check_business_hours(
-    tz: str = Query("EST", description="Timezone for business hours"),
-    start_hour: int = Query(9, ge=0, le=23),
-    end_hour: int = Query(17, ge=0, le=23),
+    tz: Annotated[str, Query(description="Timezone for business hours")] = "EST",
+    start_hour: Annotated[int, Query(ge=0, le=23)] = 9,
+    end_hour: Annotated[int, Query(ge=0, le=23)] = 17,
 ):
     """Check if current time falls within business hours"""
-    logger.debug(f"Checking business hours in {tz}: {start_hour}-{end_hour}")
+    logger.debug("Checking business hours in %s: %s-%s", tz, start_hour, end_hour)
+    
+    now_ts = time.time()
+    cache_key = (tz, start_hour, end_hour, int(now_ts))
+    cached = _BH_CACHE.get(cache_key)
+    if cached is not None and not logger.isEnabledFor(logging.DEBUG):
+        return cached
     
-    now_utc = datetime.now(timezone.utc)
-    local_time_str, _ = _convert_to_timezone(now_utc, tz)
-    local_time = datetime.fromisoformat(local_time_str)
+    now_utc = datetime.fromtimestamp(now_ts, timezone.utc)
+    tzinfos = TZINFOS
+    tzinfo = tzinfos.get(tz if tz in tzinfos else tz.upper())
+    if tzinfo is None:
+        logger.warning("Unknown timezone %s, defaulting to UTC", tz)
+        local_time = now_utc
+    else:
+        local_time = now_utc.astimezone(tzinfo)
     
     # Set breakpoint here to debug business hours logic
     is_business_hours, hours_until_open, hours_until_close = _check_if_business_hours(
         local_time, start_hour, end_hour
     )
     
-    business_start = local_time.replace(
-        hour=start_hour, minute=0, second=0, microsecond=0
-    )
-    business_end = local_time.replace(
-        hour=end_hour, minute=0, second=0, microsecond=0
+    business_start, business_end = _business_day_bounds(
+        tz, start_hour, end_hour, local_time
     )
     
-    return BusinessHoursResponse(
-        is_business_hours=is_business_hours,
-        current_time=local_time.isoformat(),
-        business_start=business_start.isoformat(),
-        business_end=business_end.isoformat(),
-        hours_until_open=hours_until_open,
-        hours_until_close=hours_until_close,
-    )
+    response = {
+        "is_business_hours": is_business_hours,
+        "current_time": local_time.isoformat(),
+        "business_start": business_start,
+        "business_end": business_end,
+        "hours_until_open": hours_until_open,
+        "hours_until_close": hours_until_close,
+    }
+    _cache_response(_BH_CACHE, cache_key, response)
+    return response
 
 
 @app.get("/time-diff")
-async def calculate_time_difference(
-    time1: str = Query(..., description="First datetime (ISO format)"),
-    time2: str = Query(..., description="Second datetime (ISO format)"),
+def calculate_time_difference(
+    time1: Annotated[str, Query(description="First datetime (ISO format)")],
+    time2: Annotated[str, Query(description="Second datetime (ISO format)")],
 ):
     """Calculate the difference between two datetimes"""
-    logger.debug(f"Calculating difference between {time1} and {time2}")
+    logger.debug("Calculating difference between %s and %s", time1, time2)
     
     try:
-        dt1 = datetime.fromisoformat(time1.replace("Z", "+00:00"))
-        dt2 = datetime.fromisoformat(time2.replace("Z", "+00:00"))
-        
-        # Good debugging point for datetime arithmetic
-        diff = dt2 - dt1
-        total_seconds = diff.total_seconds()
-        
-        return {
-            "time1": dt1.isoformat(),
-            "time2": dt2.isoformat(),
-            "difference": {
-                "days": diff.days,
-                "seconds": diff.seconds,
-                "total_seconds": total_seconds,
-                "total_minutes": total_seconds / 60,
-                "total_hours": total_seconds / 3600,
-                "total_days": total_seconds / 86400,
-            },
-        }
+        # Both inputs go through the same cached parser
+        dt1 = _parse_iso(time1)
+        dt2 = _parse_iso(time2)
     except ValueError as e:
-        logger.error(f"Invalid datetime format: {e}")
+        logger.error("Invalid datetime format: %s", e)
         raise HTTPException(status_code=400, detail=f"Invalid datetime format: {e}")
+    
+    # Good debugging point for datetime arithmetic
+    diff = dt2 - dt1
+    total_seconds = diff.total_seconds()
+    
+    return {
+        "time1": dt1.isoformat(),
+        "time2": dt2.isoformat(),
+        "difference": {
+            "days": diff.days,
+            "seconds": diff.seconds,
+            "total_seconds": total_seconds,
+            "total_minutes": total_seconds / 60,
+            "total_hours": total_seconds / 3600,
+            "total_days": total_seconds / 86400,
+        },
+    }
 
 
 # ============================================================================
@@ -196,64 +278,65 @@ async def calculate_time_difference(
 # ============================================================================
 
 
-def _convert_to_timezone(dt: datetime, tz_code: str) -> tuple[str, str]:
-    """Convert a datetime to a specific timezone"""
-    # Set a breakpoint here to understand timezone conversion logic
-    if tz_code.upper() not in TIMEZONE_OFFSETS:
-        logger.warning(f"Unknown timezone {tz_code}, defaulting to UTC")
-        return dt.isoformat(), "UTC"
-    
-    offset_hours = TIMEZONE_OFFSETS[tz_code.upper()]
-    offset = timedelta(hours=offset_hours)
-    
-    # Watch these variables during debugging
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    
-    local_dt = dt + offset
-    logger.debug(f"Converted {dt} to {tz_code}: {local_dt}")
+def _cache_response(cache: OrderedDict, key: tuple, response: dict) -> None:
+    """Store a response, dropping the oldest entries once the cache is full"""
+    cache[key] = response
+    if len(cache) > RESPONSE_CACHE_SIZE:
+        # Keys are inserted in time order, so the oldest ones are the stale seconds
+        cache.popitem(last=False)
+
+
+def _business_day_bounds(
+    tz: str, start_hour: int, end_hour: int, local_time: datetime
+) -> tuple[str, str]:
+    """Return the ISO formatted business start/end for the local day, cached per day"""
+    key = (tz, start_hour, end_hour, local_time.date())
+    bounds = _BIZ_CACHE.get(key)
+    if bounds is not None:
+        _BIZ_CACHE.move_to_end(key)
+        return bounds
     
-    return local_dt.isoformat(), tz_code.upper()
+    business_start = local_time.replace(
+        hour=start_hour, minute=0, second=0, microsecond=0
+    )
+    business_end = local_time.replace(
+        hour=end_hour, minute=0, second=0, microsecond=0
+    )
+    bounds = business_start.isoformat(), business_end.isoformat()
+    _BIZ_CACHE[key] = bounds
+    if len(_BIZ_CACHE) > BIZ_CACHE_SIZE:
+        _BIZ_CACHE.popitem(last=False)
+    return bounds
 
 
-def _calculate_time_difference(dt: datetime, tz_code: str) -> float:
-    """Calculate time difference in hours for a timezone"""
-    if tz_code.upper() not in TIMEZONE_OFFSETS:
-        return 0.0
-    return float(TIMEZONE_OFFSETS[tz_code.upper()])
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO format datetime string, accepting a trailing Z for UTC"""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
 
 
 def _check_if_business_hours(
     local_time: datetime, start_hour: int, end_hour: int
 ) -> tuple[bool, Optional[float], Optional[float]]:
     """Check if time is within business hours and calculate time until open/close"""
-    # Great function to step through with the debugger
-    current_hour = local_time.hour
-    current_minute = local_time.minute
-    current_decimal_hour = current_hour + (current_minute / 60.0)
+    # Set a breakpoint here and watch current_decimal_hour against the business hours
+    current_decimal_hour = local_time.hour + local_time.minute / 60.0
     
-    logger.debug(
-        f"Current time: {current_decimal_hour:.2f}, "
-        f"Business hours: {start_hour}-{end_hour}"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Current time: {current_decimal_hour:.2f}, "
+            f"Business hours: {start_hour}-{end_hour}"
+        )
     
     is_business_hours = start_hour <= current_decimal_hour < end_hour
-    
-    hours_until_open = None
-    hours_until_close = None
-    
-    if not is_business_hours:
-        if current_decimal_hour < start_hour:
-            # Before business hours
-            hours_until_open = start_hour - current_decimal_hour
-            logger.debug(f"Before business hours, opens in {hours_until_open:.2f}h")
-        else:
-            # After business hours
-            hours_until_open = (24 - current_decimal_hour) + start_hour
-            logger.debug(f"After business hours, opens in {hours_until_open:.2f}h")
-    else:
-        # During business hours
-        hours_until_close = end_hour - current_decimal_hour
-        logger.debug(f"Currently open, closes in {hours_until_close:.2f}h")
+    # Open: time until close. Closed: time until the next opening, today or tomorrow
+    hours_until_close = end_hour - current_decimal_hour if is_business_hours else None
+    hours_until_open = None if is_business_hours else (
+        (start_hour - current_decimal_hour)
+        if current_decimal_hour < start_hour
+        else (24 - current_decimal_hour + start_hour)
+    )
     
     return is_business_hours, hours_until_open, hours_until_close